@@ -4,8 +4,8 @@ import os
 from src.data_loader import load_inventory_data
 from src.inventory_analyzer import InventoryAnalyzer
 from src.reorder_engine import ReorderEngine
-from src.visualization import InventoryVisualizer
-from src.demand_forecaster import DemandForecaster
+from src.visualization import InventoryVisualizer, is_headless
+from src.demand_forecaster import DemandForecaster, STATSMODELS_AVAILABLE
 
 def display_menu(available_features):
     """Display the main menu options based on available features"""
@@ -33,22 +33,29 @@ def display_menu(available_features):
 
 def detect_available_features(df):
     """Detect which features are available based on columns in the dataframe"""
+    cols = frozenset(df.columns)
+    has_dates = not cols.isdisjoint({'Date_Received', 'Last_Order_Date'})
     features = {}
     
     # Basic inventory features
-    features['low_stock'] = all(col in df.columns for col in ['Stock_Quantity', 'Reorder_Level'])
-    features['reorder'] = all(col in df.columns for col in ['Stock_Quantity', 'Reorder_Level', 'Status'])
-    features['expiring'] = 'Expiration_Date' in df.columns
-    features['turnover'] = 'Sales_Volume' in df.columns and 'Stock_Quantity' in df.columns
-    features['visualization'] = 'Catagory' in df.columns and 'Stock_Quantity' in df.columns
+    features['low_stock'] = {'Stock_Quantity', 'Reorder_Level'} <= cols
+    features['reorder'] = {'Stock_Quantity', 'Reorder_Level', 'Status'} <= cols
+    features['expiring'] = 'Expiration_Date' in cols
+    features['turnover'] = {'Sales_Volume', 'Stock_Quantity'} <= cols
+    features['visualization'] = {'Catagory', 'Stock_Quantity'} <= cols
     
     # Seasonal analysis requires date and sales data
-    features['seasonal'] = any(col in df.columns for col in ['Date_Received', 'Last_Order_Date']) and 'Sales_Volume' in df.columns
+    features['seasonal'] = has_dates and 'Sales_Volume' in cols
     
     # Forecasting requires some time-based data and demand metric
-    features['forecasting'] = 'Stock_Quantity' in df.columns and any(col in df.columns for col in ['Date_Received', 'Last_Order_Date'])
+    features['forecasting'] = has_dates and 'Stock_Quantity' in cols
     
-    return features
+    # Only the names of the features that are actually available
+    return frozenset(name for name, available in features.items() if available)
+
+def chart_path(name):
+    """File to save a chart to when no display is available, None to show it"""
+    return f"{name}.png" if is_headless() else None
 
 def main():
     # Load data
@@ -104,11 +111,15 @@ def main():
 
         elif choice == "6" and 'visualization' in available_features:
             print("\nGenerating Stock Level Visualization...")
-            visualizer.plot_stock_levels()
+            saved = visualizer.plot_stock_levels(save_path=chart_path("stock_levels"))
+            if saved:
+                print(f"Chart saved to: {saved}")
 
         elif choice == "7" and 'seasonal' in available_features:
             print("\nGenerating Seasonal Turnover Visualization...")
-            visualizer.plot_seasonal_turnover()
+            saved = visualizer.plot_seasonal_turnover(save_path=chart_path("seasonal_turnover"))
+            if saved:
+                print(f"Chart saved to: {saved}")
 
         elif choice == "8" and 'forecasting' in available_features:
             try:
@@ -141,42 +152,52 @@ def main():
                 X = df[feature_columns]
                 y = df['demand']
                 
-                # Train model
-                training_result = forecaster.train(X, y)
-                print(f"\nModel trained successfully.")
-                print(f"R² score: {training_result['r2_score']:.2f}")
-                print(f"Mean Absolute Error: {training_result['mae']:.2f}")
-                print("\nFeature Importance:")
-                for feature, importance in training_result['feature_importance'].items():
-                    print(f"{feature}: {importance:.2f}")
-                
-                # Forecast for next period
                 future_days = 7
-                if 'day_index' in feature_columns:
-                    future_X = pd.DataFrame({
-                        "day_index": range(df['day_index'].max()+1, df['day_index'].max()+1+future_days)
-                    })
+                if feature_columns == ['day_index'] and STATSMODELS_AVAILABLE:
+                    # A lone time feature is a plain time series, trees can't extrapolate it
+                    future_predictions = forecaster.forecast_time_series(df, steps=future_days)
+                    
+                    print("\nForecasting with exponential smoothing (no categorical features)")
+                    print("\n📈 Forecast for Next 7 Days:")
+                    for i, val in enumerate(future_predictions, 1):
+                        print(f"Day {i}: {val:.2f} units")
+                else:
+                    # Train model
+                    time_column = 'day_index' if 'day_index' in feature_columns else None
+                    training_result = forecaster.train(X, y, time_column=time_column)
+                    print(f"\nModel trained successfully.")
+                    print(f"R² score: {training_result['r2_score']:.2f}")
+                    print(f"Mean Absolute Error: {training_result['mae']:.2f}")
+                    print("\nFeature Importance:")
+                    for feature, importance in training_result['feature_importance'].items():
+                        print(f"{feature}: {importance:.2f}")
+                
+                    # Forecast for next period
+                    if 'day_index' in feature_columns:
+                        future_X = pd.DataFrame({
+                            "day_index": range(df['day_index'].max()+1, df['day_index'].max()+1+future_days)
+                        })
                     
-                    # Handle category if it was used in training
-                    if 'Catagory' in feature_columns:
-                        median_category = df['Catagory'].mode()[0]
-                        future_X['Catagory'] = median_category
-                        print(f"\nUsing category '{median_category}' for forecasting")
+                        # Handle category if it was used in training
+                        if 'Catagory' in feature_columns:
+                            median_category = df['Catagory'].mode()[0]
+                            future_X['Catagory'] = median_category
+                            print(f"\nUsing category '{median_category}' for forecasting")
                     
-                    try:
-                        future_predictions = forecaster.forecast_future(future_X)
-                        
-                        print("\n📈 Forecast for Next 7 Days:")
-                        for i, val in enumerate(future_predictions, 1):
-                            print(f"Day {i}: {val:.2f} units")
-                    except Exception as e:
-                        print(f"\n⚠️ Forecasting error: {str(e)}")
-                        print("Trying without category features...")
-                        if 'Catagory' in future_X.columns:
-                            future_X = future_X.drop('Catagory', axis=1)
+                        try:
                             future_predictions = forecaster.forecast_future(future_X)
+                        
+                            print("\n📈 Forecast for Next 7 Days:")
                             for i, val in enumerate(future_predictions, 1):
                                 print(f"Day {i}: {val:.2f} units")
+                        except Exception as e:
+                            print(f"\n⚠️ Forecasting error: {str(e)}")
+                            print("Trying without category features...")
+                            if 'Catagory' in future_X.columns:
+                                future_X = future_X.drop('Catagory', axis=1)
+                                future_predictions = forecaster.forecast_future(future_X)
+                                for i, val in enumerate(future_predictions, 1):
+                                    print(f"Day {i}: {val:.2f} units")
                 
                 # Detect trend
                 try:
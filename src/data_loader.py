@@ -1,13 +1,58 @@
+import os
+import csv
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from datetime import datetime
 
-def load_inventory_data(filepath):
+DATE_COLS = ['Date_Received', 'Last_Order_Date', 'Expiration_Date']
+
+# Raw CSV columns used or cleaned anywhere in the system, anything else is not loaded
+KNOWN_COLS = {
+    'Product_ID', 'Product_Name', 'Catagory', 'Status',
+    'Supplier_ID', 'Supplier_Name', 'Warehouse_Location',
+    'Stock_Quantity', 'Reorder_Level', 'Reorder_Quantity',
+    'Unit_Price', 'Sales_Volume', 'Inventory_Turnover_Rate', 'percentage',
+    'Season', 'Quantity Sold',
+    *DATE_COLS
+}
+
+# Date formats tried by the Arrow CSV reader, in order (month first, like
+# the dayfirst=False fallback in clean_date_columns)
+TIMESTAMP_FORMATS = ['%Y-%m-%d', '%m/%d/%Y', '%m-%d-%Y']
+
+# Explicit Arrow types for the numeric columns we know about. Declared as
+# floats so fractional values parse; clean_numeric_columns downcasts later
+ARROW_COLUMN_TYPES = {
+    'Stock_Quantity': pa.float64(),
+    'Reorder_Level': pa.float64(),
+    'Sales_Volume': pa.float64()
+}
+
+# Stamped into the Parquet cache metadata. Bump whenever the cleaning pipeline
+# changes the cached columns or dtypes, so caches from older code are rebuilt
+CACHE_VERSION = '3'
+CACHE_VERSION_KEY = b'inventory_cache_version'
+
+def get_cache_path(filepath):
+    """Return the Parquet cache path used for a given inventory CSV file"""
+    return os.path.splitext(filepath)[0] + '.parquet'
+
+def load_inventory_data(filepath, columns=None, use_cache=True):
     """
     Load and preprocess inventory data from CSV file
     
+    The cleaned data is cached next to the CSV as a Parquet file and read
+    back directly on later calls, as long as the cache is not older than
+    the CSV.
+    
     Parameters:
         filepath (str): Path to the inventory CSV file
+        columns (list, optional): Only return these columns (if present)
+        use_cache (bool): Read from / write to the Parquet cache
         
     Returns:
         pd.DataFrame: Cleaned and processed inventory data
@@ -17,17 +62,28 @@ def load_inventory_data(filepath):
         ValueError: If data is invalid
     """
     try:
+        cache_path = get_cache_path(filepath)
+        if use_cache and _is_cache_fresh(cache_path, filepath):
+            return _read_cache(cache_path, columns)
+        
         # Load the CSV file
-        df = pd.read_csv(filepath)
+        df = read_inventory_csv(filepath)
         
         # Clean and transform data based on available columns
         df = clean_numeric_columns(df)
         df = clean_date_columns(df)
         df = clean_status_column(df)
+        df = convert_categorical_columns(df)
         
         # Calculate additional metrics if possible
         df = calculate_additional_metrics(df)
         
+        if use_cache:
+            _write_cache(df, cache_path)
+        
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+        
         return df
         
     except FileNotFoundError:
@@ -37,35 +93,133 @@ def load_inventory_data(filepath):
     except Exception as e:
         raise ValueError(f"Error loading inventory data: {str(e)}")
 
+def _is_cache_fresh(cache_path, filepath):
+    """Check whether the Parquet cache exists, is not older than the CSV and
+    was written by the current cleaning code"""
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(filepath)
+    if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(filepath):
+        return False
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        # Unreadable cache, rebuild it from the CSV
+        return False
+    return metadata.get(CACHE_VERSION_KEY) == CACHE_VERSION.encode()
+
+def _read_cache(cache_path, columns=None):
+    """Read the cleaned inventory data back from the Parquet cache"""
+    if columns is not None:
+        cached_cols = pq.read_schema(cache_path).names
+        columns = [col for col in columns if col in cached_cols]
+    return pd.read_parquet(cache_path, columns=columns, engine='pyarrow')
+
+def _write_cache(df, cache_path):
+    """Write the cleaned inventory data to the Parquet cache"""
+    try:
+        table = pa.Table.from_pandas(df)
+        metadata = {**(table.schema.metadata or {}), CACHE_VERSION_KEY: CACHE_VERSION.encode()}
+        pq.write_table(table.replace_schema_metadata(metadata), cache_path, compression='zstd')
+    except OSError as e:
+        # Caching is an optimisation only, never fail the load because of it
+        print(f"Warning: could not write inventory cache to {cache_path}: {e}")
+
+def read_inventory_csv(filepath, columns=KNOWN_COLS):
+    """
+    Read the raw inventory CSV with the multi-threaded Arrow reader
+    
+    Only header columns listed in `columns` are parsed (all columns if none
+    of them match). Dates matching TIMESTAMP_FORMATS are parsed by Arrow
+    directly, and the currency/percentage columns are stripped and cast in
+    Arrow before the table is handed to pandas.
+    """
+    if os.path.getsize(filepath) == 0:
+        raise pd.errors.EmptyDataError("No columns to parse from file")
+    
+    with open(filepath, newline='', encoding='utf-8-sig') as f:
+        header = next(csv.reader(f), [])
+    include_columns = [col for col in header if col in columns]
+    
+    def read(column_types):
+        return pv.read_csv(
+            filepath,
+            parse_options=pv.ParseOptions(delimiter=','),
+            convert_options=pv.ConvertOptions(
+                column_types=column_types,
+                include_columns=include_columns,
+                timestamp_parsers=TIMESTAMP_FORMATS,
+                strings_can_be_null=True
+            )
+        )
+    
+    try:
+        table = read(ARROW_COLUMN_TYPES)
+    except pa.ArrowInvalid:
+        # A non-numeric cell in a typed column, let Arrow infer the types and
+        # leave the coercion to clean_numeric_columns
+        table = read(None)
+    return clean_arrow_table(table).to_pandas()
+
+def clean_prices(prices):
+    """Strip currency symbols, separators and padding from Arrow price strings, cast to float64"""
+    cleaned = pc.replace_substring_regex(prices, pattern='[$€£,]', replacement='')
+    return pc.cast(pc.utf8_trim_whitespace(cleaned), pa.float64())
+
+def clean_arrow_table(table):
+    """Clean string-typed price/percentage/date columns of an Arrow table"""
+    names = table.column_names
+    
+    # Clean percentage column if exists
+    if 'percentage' in names and pa.types.is_string(table['percentage'].type):
+        col = pc.utf8_rtrim(pc.utf8_trim_whitespace(table['percentage']), characters='%')
+        col = pc.divide(pc.cast(col, pa.float64()), 100)
+        table = table.set_column(names.index('percentage'), 'percentage', col)
+    
+    # Clean unit price if exists
+    if 'Unit_Price' in names and pa.types.is_string(table['Unit_Price'].type):
+        table = table.set_column(names.index('Unit_Price'), 'Unit_Price', clean_prices(table['Unit_Price']))
+    
+    # Store parsed dates as datetime64[ns]. The pandas fallback in clean_date_columns
+    # may use another unit (us on pandas 3), so consumers must not assume one
+    for col in DATE_COLS:
+        if col in names and pa.types.is_timestamp(table[col].type):
+            table = table.set_column(names.index(col), col, pc.cast(table[col], pa.timestamp('ns')))
+    
+    return table
+
 def clean_numeric_columns(df):
     """Clean and convert numeric columns that exist"""
     # Clean percentage column if exists
-    if 'percentage' in df.columns:
+    if 'percentage' in df.columns and not pd.api.types.is_numeric_dtype(df['percentage']):
         df['percentage'] = (
             df['percentage'].astype(str).str.rstrip('%').astype(float) / 100
         )
     
     # Clean unit price if exists
-    if 'Unit_Price' in df.columns:
-        df['Unit_Price'] = (
-            df['Unit_Price'].astype(str).str.replace('[$€£,]', '', regex=True).astype(float)
-        )
+    if 'Unit_Price' in df.columns and not pd.api.types.is_numeric_dtype(df['Unit_Price']):
+        prices = clean_prices(pa.array(df['Unit_Price'].astype('string'), type=pa.string()))
+        df['Unit_Price'] = pd.Series(prices.to_numpy(zero_copy_only=False), index=df.index)
     
     # Convert numeric columns to proper types
     numeric_cols = ['Stock_Quantity', 'Reorder_Level', 'Sales_Volume', 'Reorder_Quantity']
     for col in numeric_cols:
         if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+            df[col] = downcast_integer(pd.to_numeric(df[col], errors='coerce').fillna(0))
     
     return df
 
+def downcast_integer(values):
+    """Store whole-number counts as int32, leave anything else untouched"""
+    int32 = np.iinfo(np.int32)
+    if (values % 1 == 0).all() and values.between(int32.min, int32.max).all():
+        return values.astype('int32')
+    return values
+
 def clean_date_columns(df):
     """Clean and convert date columns that exist"""
-    date_cols = ['Date_Received', 'Last_Order_Date', 'Expiration_Date']
-    
-    for col in date_cols:
-        if col in df.columns:
-            # Try multiple date formats
+    for col in DATE_COLS:
+        # Arrow already parsed the known formats, only fall back for the rest
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
             df[col] = pd.to_datetime(
                 df[col],
                 format='mixed',
@@ -78,16 +232,30 @@ def clean_date_columns(df):
 def clean_status_column(df):
     """Clean and standardize status column if exists"""
     if 'Status' in df.columns:
-        df['Status'] = (
-            df['Status'].astype(str).str.strip().str.title()
-        )
         # Standardize status values
         status_map = {
             'Active': 'Active',
             'Inactive': 'Inactive',
             'Discontinued': 'Inactive'
         }
-        df['Status'] = df['Status'].map(status_map).fillna('Active')
+        status_values = ['Active', 'Inactive']
+        
+        # Clean the distinct values only, then remap the integer codes in one go
+        status = df['Status'].astype('category')
+        labels = status.cat.categories.astype(str).str.strip().str.title()
+        lookup = np.array(
+            [status_values.index(status_map.get(label, 'Active')) for label in labels]
+            + [0]  # Missing values (code -1) become 'Active'
+        )
+        df['Status'] = pd.Categorical.from_codes(lookup[status.cat.codes], categories=status_values)
+    
+    return df
+
+def convert_categorical_columns(df):
+    """Store low-cardinality label columns as pandas categoricals"""
+    for col in ['Catagory', 'Status']:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
     
     return df
 
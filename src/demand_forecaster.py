@@ -1,51 +1,144 @@
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
+try:
+    # Use the oneDAL-accelerated random forest when scikit-learn-intelex is installed.
+    # Must run before the sklearn estimators below are imported.
+    from sklearnex import patch_sklearn
+    patch_sklearn(['RandomForestRegressor'], verbose=False)
+except ImportError:
+    pass
+
+try:
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+    STATSMODELS_AVAILABLE = True
+except ImportError:
+    STATSMODELS_AVAILABLE = False
+
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import r2_score, mean_absolute_error
 from sklearn.preprocessing import OneHotEncoder
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from scipy import sparse
 import warnings
 
 class DemandForecaster:
-    def __init__(self):
-        self.model = RandomForestRegressor(
-            n_estimators=100,
-            random_state=42,
-            min_samples_leaf=5
-        )
+    MODEL_TYPES = ('hist_gradient_boosting', 'random_forest')
+    # Native categorical splits support at most this many levels per column
+    MAX_NATIVE_CATEGORIES = 255
+    UNKNOWN_CATEGORY = '__unknown__'
+
+    def __init__(self, model_type='hist_gradient_boosting'):
+        if model_type not in self.MODEL_TYPES:
+            raise ValueError(f"Unknown model type '{model_type}'. Choose one of: {', '.join(self.MODEL_TYPES)}")
+        self.model_type = model_type
+        # Model actually used by the last fit, see train()
+        self.active_model_type = model_type
+        self.model = self._build_model(model_type)
         self.feature_columns = []
         self.target_column = 'demand'
         self.encoder = None
+        self.dense_features = []
+        self.category_dtypes = {}
+        self.feature_importances = None
         self.numeric_features = []
         self.categorical_features = []
+        self.date_features = []
         self.trained = False
 
-    def train(self, X, y):
-        """Train the model with available features"""
+    def _build_model(self, model_type):
+        """Create a fresh, unfitted estimator for the given model type"""
+        if model_type == 'hist_gradient_boosting':
+            # Histogram-based boosting handles categorical columns natively
+            return HistGradientBoostingRegressor(
+                max_iter=200,
+                learning_rate=0.05,
+                max_bins=self.MAX_NATIVE_CATEGORIES,
+                categorical_features='from_dtype',
+                random_state=42
+            )
+        return RandomForestRegressor(
+            n_estimators=100,
+            random_state=42,
+            min_samples_leaf=5,
+            n_jobs=-1  # Build and evaluate trees on all cores
+        )
+
+    def train(self, X, y, time_column=None):
+        """
+        Train the model with available features
+        
+        The most recent 20% of rows, ordered by `time_column` (default: the
+        first datetime feature, else row order), are held out for evaluation.
+        """
         if len(X) == 0:
             raise ValueError("No features available for training")
+        
+        # Drop everything learned by a previous fit
+        self.feature_columns = []
+        self.encoder = None
+        self.dense_features = []
+        self.category_dtypes = {}
+        self.feature_importances = None
+        self.trained = False
             
         original_columns = X.columns.tolist()
+        # Column roles are fixed at training time and reused for every prediction
+        self.date_features = [col for col in X.columns
+                              if pd.api.types.is_datetime64_any_dtype(X[col])]
         self.numeric_features = X.select_dtypes(include=np.number).columns.tolist()
-        self.categorical_features = X.select_dtypes(exclude=np.number).columns.tolist()
+        self.categorical_features = [col for col in X.select_dtypes(exclude=np.number).columns
+                                     if col not in self.date_features]
+        
+        # Too many levels for native categorical splits, one-hot encode them for a random forest
+        self.active_model_type = self.model_type
+        if self.model_type == 'hist_gradient_boosting':
+            high_cardinality = [col for col in self.categorical_features
+                                if X[col].nunique() > self.MAX_NATIVE_CATEGORIES]
+            if high_cardinality:
+                warnings.warn(
+                    f"Categorical features {', '.join(high_cardinality)} have more than "
+                    f"{self.MAX_NATIVE_CATEGORIES} levels, training a random forest instead"
+                )
+                self.active_model_type = 'random_forest'
+        self.model = self._build_model(self.active_model_type)
         
         X_processed = self._preprocess_features(X, training=True)
         
-        X_train, X_test, y_train, y_test = train_test_split(
-            X_processed, y, test_size=0.2, random_state=42
-        )
+        # Chronological split, evaluating on data newer than anything trained on
+        if time_column is None and self.date_features:
+            time_column = self.date_features[0]
+        if time_column is not None:
+            order = np.argsort(X[time_column].to_numpy(), kind='stable')
+        else:
+            order = np.arange(len(X))
+        split = len(order) - int(np.ceil(len(order) * 0.2))
+        train_idx, test_idx = order[:split], order[split:]
+        
+        X_train, X_test = self._take_rows(X_processed, train_idx), self._take_rows(X_processed, test_idx)
+        y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
         
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             self.model.fit(X_train, y_train)
         
-        self.feature_columns = X_processed.columns.tolist()
+        if not sparse.issparse(X_processed):
+            self.feature_columns = X_processed.columns.tolist()
         self.trained = True
         
         y_pred = self.model.predict(X_test)
         r2 = r2_score(y_test, y_pred)
         mae = mean_absolute_error(y_test, y_pred)
         
+        if hasattr(self.model, 'feature_importances_'):
+            self.feature_importances = self.model.feature_importances_
+        else:
+            # Boosted models have no impurity importances, use permutation importance instead
+            self.feature_importances = permutation_importance(
+                self.model, X_test, y_test, n_repeats=5, random_state=42
+            ).importances_mean
+        
         # Return metrics as a dictionary with properly formatted values
         return {
             'r2_score': float(r2),  # Convert numpy float to Python float
@@ -57,7 +150,7 @@ class DemandForecaster:
         """Format feature importance for safe string representation"""
         importance = dict(zip(
             self.feature_columns,
-            [float(x) for x in self.model.feature_importances_]  # Convert numpy floats
+            np.asarray(self.feature_importances, dtype=np.float64).tolist()  # Convert numpy floats
         ))
         # Sort by importance
         return dict(sorted(importance.items(), key=lambda item: item[1], reverse=True))
@@ -71,31 +164,46 @@ class DemandForecaster:
     def forecast_future(self, X_future):
         predictions = self.predict(X_future)
         # Convert numpy array to list for better serialization
-        return [float(x) for x in predictions]
+        return predictions.astype(np.float64, copy=False).tolist()
+
+    def forecast_time_series(self, df, steps=7, time_col='day_index', column='demand'):
+        """Forecast total demand per time step with Holt's linear exponential smoothing"""
+        if not STATSMODELS_AVAILABLE:
+            raise ValueError("statsmodels is required for time series forecasting")
+        if time_col not in df.columns or column not in df.columns:
+            raise ValueError(f"Columns '{time_col}' and '{column}' are required")
+        
+        # Rows without a time step (e.g. unparseable dates) can't be placed in the series
+        series = df.dropna(subset=[time_col]).groupby(time_col)[column].sum().sort_index()
+        if len(series) < 2:
+            raise ValueError("Insufficient data for time series forecasting")
+        series.index = series.index.astype(np.int64)
+        # Steps without any records count as zero demand
+        series = series.reindex(range(series.index.min(), series.index.max() + 1), fill_value=0)
+        
+        model = ExponentialSmoothing(series.to_numpy(dtype=np.float64), trend='add', seasonal=None).fit()
+        return model.forecast(steps).astype(np.float64, copy=False).tolist()
 
     def _preprocess_features(self, X, training=False):
         X_processed = X.copy()
         
-        date_cols = [col for col in X_processed.columns 
-                    if pd.api.types.is_datetime64_any_dtype(X_processed[col])]
-        for col in date_cols:
-            X_processed[col] = X_processed[col].astype(np.int64) // 10**9
+        for col in self.date_features:
+            if col in X_processed.columns:
+                X_processed[col] = self._to_epoch_seconds(X_processed[col])
         
-        if self.categorical_features:
+        if self.categorical_features and self.active_model_type == 'hist_gradient_boosting':
+            # No one-hot expansion needed, the model splits on category codes directly
             if training:
-                self.encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=False)
-                encoded_data = self.encoder.fit_transform(X_processed[self.categorical_features])
-            else:
-                try:
-                    encoded_data = self.encoder.transform(X_processed[self.categorical_features])
-                except AttributeError:
-                    raise ValueError("Model has not been trained with categorical features")
-                
-            encoded_cols = self.encoder.get_feature_names_out(self.categorical_features)
-            encoded_df = pd.DataFrame(encoded_data, columns=encoded_cols, index=X_processed.index)
-            
-            X_processed = X_processed.drop(columns=self.categorical_features)
-            X_processed = pd.concat([X_processed, encoded_df], axis=1)
+                self.category_dtypes = {
+                    col: pd.CategoricalDtype(X_processed[col].dropna().unique())
+                    for col in self.categorical_features
+                }
+            for col in self.categorical_features:
+                if col in X_processed.columns:
+                    X_processed[col] = X_processed[col].astype(self.category_dtypes[col])
+        elif self.categorical_features:
+            # One-hot encode straight into a sparse matrix, never densifying the encoded block
+            return self._encode_sparse(X_processed, training)
         
         for col in self.numeric_features:
             if col not in X_processed.columns and col not in self.categorical_features:
@@ -105,45 +213,87 @@ class DemandForecaster:
             return X_processed
         else:
             available_cols = [col for col in self.feature_columns if col in X_processed.columns]
-            return X_processed[available_cols].reindex(columns=self.feature_columns, fill_value=0)
+            X_processed = X_processed[available_cols].reindex(columns=self.feature_columns, fill_value=0)
+            # Categorical columns missing from the input are passed on as unknown categories
+            for col, dtype in self.category_dtypes.items():
+                if col not in available_cols:
+                    X_processed[col] = pd.Series(np.nan, index=X_processed.index).astype(dtype)
+            return X_processed
+
+    @staticmethod
+    def _take_rows(X_processed, positions):
+        """Select rows by position from a DataFrame or a sparse matrix"""
+        if sparse.issparse(X_processed):
+            return X_processed[positions]
+        return X_processed.iloc[positions]
 
-    def detect_trend(self, df, column='demand', window_size=5):
+    def _encode_sparse(self, X_processed, training=False):
+        """Build a CSR matrix of the dense features followed by one-hot encoded categories"""
+        if training:
+            self.encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=True)
+            encoded_data = self.encoder.fit_transform(X_processed[self.categorical_features])
+            self.dense_features = [col for col in X_processed.columns
+                                   if col not in self.categorical_features]
+            self.feature_columns = self.dense_features + self.encoder.get_feature_names_out(
+                self.categorical_features).tolist()
+        else:
+            if self.encoder is None:
+                raise ValueError("Model has not been trained with categorical features")
+            # Categorical columns missing from the input encode to all zeros
+            for col in self.categorical_features:
+                if col not in X_processed.columns:
+                    X_processed[col] = self.UNKNOWN_CATEGORY
+            encoded_data = self.encoder.transform(X_processed[self.categorical_features])
+        
+        dense = X_processed.reindex(columns=self.dense_features, fill_value=0)
+        return sparse.hstack(
+            [sparse.csr_matrix(dense.to_numpy(dtype=np.float64)), encoded_data],
+            format='csr'
+        )
+
+    @staticmethod
+    def _to_epoch_seconds(dates):
+        """Convert a datetime column to integer seconds since the epoch"""
+        if isinstance(dates.dtype, pd.ArrowDtype):
+            # Arrow-backed timestamps are cast in Arrow, whatever their unit
+            seconds = pc.cast(pc.cast(pa.array(dates), pa.timestamp('s'), safe=False), pa.int64())
+            return pd.Series(pd.array(seconds, dtype=pd.ArrowDtype(pa.int64())), index=dates.index)
+        # datetime64 columns may be in ns, us, ms or s, normalise before taking integers
+        return dates.dt.as_unit('s').astype(np.int64)
+
+    def detect_trend(self, df, column='demand'):
         if column not in df.columns:
             raise ValueError(f"Column '{column}' not found in dataframe")
             
-        window_size = min(window_size, len(df))
-        if window_size < 2:
+        y = df[column].to_numpy(dtype=np.float64)
+        y = y[~np.isnan(y)]
+        if len(y) < 2:
             return {
                 'trend': "insufficient data",
                 'strength': 0,
-                'data': df.to_dict()  # Convert DataFrame to dict for safe serialization
+                'slope': 0.0
             }
-            
-        trend_df = df.copy()
-        trend_df['rolling_avg'] = trend_df[column].rolling(window=window_size).mean()
         
-        valid_values = trend_df['rolling_avg'].dropna()
-        if len(valid_values) < 2:
+        # Least-squares line through the whole series, not just its endpoints
+        x = np.arange(len(y), dtype=np.float64)
+        slope, intercept = np.polyfit(x, y, 1)
+        
+        # A slope within rounding noise of zero is a flat series, not a trend
+        if np.isclose(slope, 0, atol=1e-12 * max(abs(y.mean()), 1)):
             return {
-                'trend': "insufficient data",
-                'strength': 0,
-                'data': trend_df.to_dict()
+                'trend': "stable",
+                'strength': 0.0,
+                'slope': 0.0
             }
-            
-        start_val = valid_values.iloc[0]
-        end_val = valid_values.iloc[-1]
         
-        if end_val > start_val:
-            direction = "increasing"
-            strength = float((end_val - start_val) / start_val)
-        else:
-            direction = "decreasing"
-            strength = float((start_val - end_val) / start_val)
+        direction = "increasing" if slope > 0 else "decreasing"
+        # Fitted change over the series relative to its mean level
+        strength = float(abs(slope) * len(y) / max(y.mean(), 1e-9))
             
         return {
             'trend': direction,
             'strength': strength,
-            'data': trend_df.to_dict()
+            'slope': float(slope)
         }
 
     def get_feature_importance(self):
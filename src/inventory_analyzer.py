@@ -4,10 +4,26 @@ from datetime import datetime, timedelta
 class InventoryAnalyzer:
     def __init__(self, inventory_df):
         self.df = inventory_df
+        self._cache = {}
+        self._df_version = 0
+        
+    def invalidate_cache(self):
+        """Drop cached results, call after modifying the DataFrame in place"""
+        self._df_version += 1
+        self._cache.clear()
+        
+    def _cache_key(self, name, *args):
+        """Build a cache key that changes when the DataFrame is replaced or reshaped.
+        Cached results are always handed out as copies, so callers may modify them"""
+        return (name, args, id(self.df), self.df.shape, self._df_version)
         
     def analyze_seasonal_turnover(self, season_choice):
         """Analyze turnover by season (weekly/monthly) if possible"""
-        df = self.df.copy()
+        key = self._cache_key('seasonal_turnover', season_choice)
+        if key in self._cache:
+            return self._cache[key].copy()
+        
+        df = self.df
         
         # Try different possible date columns
         date_columns = ['Date_Received', 'Last_Order_Date', 'Expiration_Date']
@@ -24,24 +40,29 @@ class InventoryAnalyzer:
         if 'Sales_Volume' not in df.columns:
             raise ValueError("Data is missing required 'Sales_Volume' column")
         
-        df['Season'] = pd.NaT
         if season_choice == '1':  # Weekly
-            df['Season'] = df[date_col].dt.to_period('W').apply(lambda r: r.start_time)
+            freq = 'W'
         elif season_choice == '2':  # Monthly
-            df['Season'] = df[date_col].dt.to_period('M').apply(lambda r: r.start_time)
+            freq = 'M'
         else:
             raise ValueError("Invalid season choice. Choose 1 (Weekly) or 2 (Monthly)")
         
-        group_cols = ['Season']
+        # Group the sales column by derived keys, no need to copy the frame
+        group_keys = [df[date_col].dt.to_period(freq).dt.start_time.rename('Season')]
         if 'Catagory' in df.columns:
-            group_cols.append('Catagory')
+            group_keys.append(df['Catagory'])
         
-        turnover = df.groupby(group_cols)['Sales_Volume'].sum().reset_index()
-        return turnover
+        turnover = df['Sales_Volume'].groupby(group_keys, observed=True).sum().reset_index()
+        self._cache[key] = turnover
+        return turnover.copy()
     
     def get_low_stock_items(self, threshold_days=7):
         """Identify items that need reordering soon if possible"""
-        df = self.df.copy()
+        key = self._cache_key('low_stock', threshold_days)
+        if key in self._cache:
+            return self._cache[key].copy()
+        
+        df = self.df
         
         # Check minimum required columns
         if 'Stock_Quantity' not in df.columns:
@@ -56,28 +77,38 @@ class InventoryAnalyzer:
         
         # Simple low stock detection based on reorder level if available
         if 'Reorder_Level' in df.columns:
-            low_stock = df[df['Stock_Quantity'] <= df['Reorder_Level']]
+            mask = df['Stock_Quantity'] <= df['Reorder_Level']
             result_cols.append('Reorder_Level')
         else:
             # Fallback: use arbitrary threshold if no reorder level
-            low_stock = df[df['Stock_Quantity'] <= 10]  # Default threshold
+            mask = df['Stock_Quantity'] <= 10  # Default threshold
             
         # Add days until stockout if sales data available
+        days_until_stockout = None
         if 'Sales_Volume' in df.columns:
-            df['days_until_stockout'] = (df['Stock_Quantity'] / df['Sales_Volume']) * 30
-            low_stock = df[df['days_until_stockout'] <= threshold_days]
-            result_cols.append('days_until_stockout')
+            days_until_stockout = (df['Stock_Quantity'] / df['Sales_Volume']) * 30
+            mask = days_until_stockout <= threshold_days
         
         # Filter by status if available
         if 'Status' in df.columns:
-            low_stock = low_stock[low_stock['Status'] == 'Active']
+            mask &= df['Status'] == 'Active'
+        
+        low_stock = df.loc[mask, result_cols]
+        if days_until_stockout is not None:
+            low_stock = low_stock.assign(days_until_stockout=days_until_stockout[mask])
         
-        return low_stock[result_cols]
+        self._cache[key] = low_stock
+        return low_stock.copy()
     
     def get_expiring_soon(self, days=30):
         """Identify items expiring soon if expiration data exists"""
         if 'Expiration_Date' not in self.df.columns:
             raise ValueError("Data is missing required 'Expiration_Date' column")
+        
+        # Keyed by date as well, so the window moves forward day by day
+        key = self._cache_key('expiring_soon', days, datetime.now().date())
+        if key in self._cache:
+            return self._cache[key].copy()
             
         today = datetime.now()
         expiring = self.df[
@@ -90,8 +121,9 @@ class InventoryAnalyzer:
             result_cols.append('Catagory')
         if 'Stock_Quantity' in self.df.columns:
             result_cols.append('Stock_Quantity')
-            
-        return expiring[result_cols]
+        
+        self._cache[key] = expiring[result_cols]
+        return self._cache[key].copy()
     
     def analyze_turnover(self):
         """Analyze inventory turnover rates if possible"""
@@ -102,16 +134,21 @@ class InventoryAnalyzer:
             turnover_col = 'Inventory_Turnover_Rate'
         else:
             raise ValueError("Insufficient data to calculate turnover rates")
+        
+        key = self._cache_key('turnover')
+        if key in self._cache:
+            return self._cache[key].copy()
             
         group_col = 'Catagory' if 'Catagory' in self.df.columns else None
         
         if group_col:
-            turnover_stats = self.df.groupby(group_col)[turnover_col].agg(['mean', 'median', 'std'])
+            turnover_stats = self.df.groupby(group_col, observed=True)[turnover_col].agg(['mean', 'median', 'std'])
         else:
             turnover_stats = pd.DataFrame({
                 'mean': [self.df[turnover_col].mean()],
                 'median': [self.df[turnover_col].median()],
                 'std': [self.df[turnover_col].std()]
             }, index=['Overall'])
-            
-        return turnover_stats
\ No newline at end of file
+        
+        self._cache[key] = turnover_stats
+        return turnover_stats.copy()
\ No newline at end of file
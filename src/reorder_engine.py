@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 
 class ReorderEngine:
@@ -11,43 +12,44 @@ class ReorderEngine:
         if not all(col in self.df.columns for col in required_cols):
             raise ValueError(f"Missing required columns: {', '.join(required_cols)}")
             
-        reorder_list = []
+        mask = (self.df['Stock_Quantity'] <= self.df['Reorder_Level']) & (self.df['Status'] == 'Active')
+        n = int(mask.sum())
         
-        for _, row in self.df.iterrows():
-            if row['Stock_Quantity'] <= row['Reorder_Level'] and row['Status'] == 'Active':
-                item = {
-                    'Product_ID': row.get('Product_ID', 'N/A'),
-                    'Product_Name': row.get('Product_Name', 'N/A'),
-                    'Current_Stock': row['Stock_Quantity'],
-                    'Reorder_Level': row['Reorder_Level']
-                }
-                
-                # Calculate suggested quantity if possible
-                if 'Reorder_Quantity' in row:
-                    item['Suggested_Order_Qty'] = row['Reorder_Quantity']
-                elif 'Sales_Volume' in row:
-                    item['Suggested_Order_Qty'] = max(10, (row['Sales_Volume'] / 30) * 14)  # 2 weeks supply
-                else:
-                    item['Suggested_Order_Qty'] = max(10, row['Reorder_Level'] * 2)
-                
-                # Add supplier info if available
-                if 'Supplier_ID' in row:
-                    item['Supplier_ID'] = row['Supplier_ID']
-                if 'Supplier_Name' in row:
-                    item['Supplier_Name'] = row['Supplier_Name']
-                
-                # Add pricing info if available
-                if 'Unit_Price' in row:
-                    item['Unit_Price'] = row['Unit_Price']
-                    item['Estimated_Cost'] = item['Suggested_Order_Qty'] * row['Unit_Price']
-                
-                # Add location info if available
-                if 'Warehouse_Location' in row:
-                    item['Warehouse'] = row['Warehouse_Location']
-                
-                reorder_list.append(item)
+        def column(name):
+            # Only the selected rows of the needed column are materialized
+            return self.df.loc[mask, name].to_numpy()
         
-        return pd.DataFrame(reorder_list)
+        out = {}
+        for col in ['Product_ID', 'Product_Name']:
+            out[col] = column(col) if col in self.df.columns else np.full(n, 'N/A', dtype=object)
+        out['Current_Stock'] = column('Stock_Quantity')
+        out['Reorder_Level'] = column('Reorder_Level')
+        
+        # Calculate suggested quantity if possible
+        if 'Reorder_Quantity' in self.df.columns:
+            suggested = column('Reorder_Quantity')
+        elif 'Sales_Volume' in self.df.columns:
+            two_weeks = column('Sales_Volume') / 30 * 14  # 2 weeks supply
+            suggested = np.where(np.isnan(two_weeks), 10, np.maximum(10, two_weeks))
+        else:
+            suggested = np.maximum(10, out['Reorder_Level'] * 2)
+        out['Suggested_Order_Qty'] = suggested
+        
+        # Add supplier info if available
+        for col in ['Supplier_ID', 'Supplier_Name']:
+            if col in self.df.columns:
+                out[col] = column(col)
+        
+        # Add pricing info if available
+        if 'Unit_Price' in self.df.columns:
+            out['Unit_Price'] = column('Unit_Price')
+            out['Estimated_Cost'] = suggested * out['Unit_Price']
+        
+        # Add location info if available
+        if 'Warehouse_Location' in self.df.columns:
+            out['Warehouse'] = column('Warehouse_Location')
+        
+        return pd.DataFrame(out, copy=False)
     
     def predict_future_demand(self, product_id, days=30):
         """Simple demand prediction based on historical sales if available"""
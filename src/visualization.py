@@ -1,24 +1,58 @@
+import os
+import sys
 import pandas as pd
+import matplotlib
+
+# Without a display there is nothing to show, skip loading a GUI backend
+if (sys.platform.startswith('linux') and 'MPLBACKEND' not in os.environ
+        and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY')):
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
 
+NON_INTERACTIVE_BACKENDS = ('agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template')
+
+def is_headless():
+    """Whether the active matplotlib backend can't display windows"""
+    return plt.get_backend().lower() in NON_INTERACTIVE_BACKENDS
+
 class InventoryVisualizer:
     def __init__(self, df):
         self.df = df
+        self._fig = None
 
-    def plot_stock_levels(self):
+    def _get_axes(self):
+        """Reuse the same figure across plots, unless its window was closed"""
+        if self._fig is None or not plt.fignum_exists(self._fig.number):
+            self._fig = plt.figure()
+        else:
+            self._fig.clf()
+        return self._fig.add_subplot()
+
+    def _render(self, save_path=None):
+        """Save the current figure to save_path if given, otherwise show it.
+        Returns the path the figure was saved to, if any"""
+        self._fig.tight_layout()
+        if save_path:
+            self._fig.savefig(save_path, dpi=90)
+            return save_path
+        plt.show()
+        return None
+
+    def plot_stock_levels(self, save_path=None):
         """Plot stock levels by category if possible"""
         if 'Catagory' not in self.df.columns or 'Stock_Quantity' not in self.df.columns:
             print("Insufficient data for stock level visualization")
             return
             
-        stock_by_category = self.df.groupby('Catagory')['Stock_Quantity'].sum()
-        stock_by_category.plot(kind='bar', title='Stock Levels by Category')
-        plt.xlabel('Category')
-        plt.ylabel('Stock Quantity')
-        plt.tight_layout()
-        plt.show()
+        stock_by_category = self.df.groupby('Catagory', observed=True)['Stock_Quantity'].sum()
+        ax = self._get_axes()
+        stock_by_category.plot(kind='bar', title='Stock Levels by Category', ax=ax)
+        ax.set_xlabel('Category')
+        ax.set_ylabel('Stock Quantity')
+        return self._render(save_path)
 
-    def plot_seasonal_turnover(self):
+    def plot_seasonal_turnover(self, save_path=None):
         """Plot seasonal turnover patterns if possible"""
         date_col = None
         for col in ['Date_Received', 'Last_Order_Date', 'Expiration_Date']:
@@ -30,28 +64,30 @@ class InventoryVisualizer:
             print("Insufficient data for seasonal turnover visualization")
             return
             
-        df = self.df.copy()
-        df['Month'] = df[date_col].dt.month
+        month = self.df[date_col].dt.month.rename('Month')
+        sales = self.df['Sales_Volume']
+        ax = self._get_axes()
         
-        if 'Catagory' in df.columns:
+        if 'Catagory' in self.df.columns:
             # Plot by category if available
-            monthly_avg = df.groupby(['Month', 'Catagory'])['Sales_Volume'].mean().unstack()
+            monthly_avg = sales.groupby([month, self.df['Catagory']], observed=True).mean().unstack()
             monthly_avg.plot(
                 kind='line', 
                 marker='o', 
-                title='Average Monthly Turnover by Category'
+                title='Average Monthly Turnover by Category',
+                ax=ax
             )
         else:
             # Overall plot if no category
-            monthly_avg = df.groupby('Month')['Sales_Volume'].mean()
+            monthly_avg = sales.groupby(month).mean()
             monthly_avg.plot(
                 kind='line', 
                 marker='o', 
-                title='Average Monthly Turnover'
+                title='Average Monthly Turnover',
+                ax=ax
             )
             
-        plt.xlabel('Month')
-        plt.ylabel('Average Sales Volume')
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        ax.set_xlabel('Month')
+        ax.set_ylabel('Average Sales Volume')
+        ax.grid(True)
+        return self._render(save_path)
\ No newline at end of file